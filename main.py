@@ -1,12 +1,15 @@
 import os
 import logging
 import time
+import argparse
+from scanner.data import get_history, seed_history
+from scanner.snapshot import load_snapshot, save_snapshot
 from scanner.scanner import run
 
 def setup_logging():
     # Create logs directory if it doesn't exist
     os.makedirs('logs', exist_ok=True)
-    
+
     # Set up file and console logging
     logging.basicConfig(
         level=logging.INFO,
@@ -17,20 +20,42 @@ def setup_logging():
         ]
     )
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="RSI & MACD Stock Scanner")
+    parser.add_argument(
+        "--continuous",
+        action="store_true",
+        help="Keep scanning in this process after the one-shot scan"
+    )
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     setup_logging()
-    
+
     # Check if environment variables are set
     if not os.getenv("TELEGRAM_BOT_TOKEN") or not os.getenv("TELEGRAM_CHAT_ID"):
         logging.warning("Please set TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID environment variables")
         logging.info("You can set them in your environment or create a .env file")
         exit(1)
-    
+
+    # Warm start from the previous run's snapshot so only the newest bars are downloaded
+    snapshot = load_snapshot()
+    seed_history(snapshot['bars'])
+
     logging.info("Starting RSI & MACD Stock Scanner")
     try:
         run()
         logging.info("Scan completed successfully")
     except Exception as e:
         logging.error(f"Error during scan: {e}")
-    finally:
+
+    if args.continuous:
+        # Imported here so the one-shot scan does not pay for the realtime module
+        from scanner.realtime_scanner import run_continuous_scanner
+
+        logging.info("Switching to continuous mode")
+        run_continuous_scanner(snapshot)
+    else:
+        save_snapshot(get_history(), snapshot['indicators'], snapshot['signals'])
         logging.info("Scanner process finished")
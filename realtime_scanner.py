@@ -4,9 +4,11 @@ import logging
 import signal
 import pickle
 import datetime
-from scanner.data import get_data
+from scanner.data import get_data, get_history, seed_history, commit_bar_store
 from scanner.strategy import calculate_rsi_macd
 from scanner.telegram_bot import send_telegram_message
+from scanner.snapshot import load_snapshot, save_snapshot
+from scanner.query_api import IndicatorTable, indicator_row, start_query_server
 
 # Configure logging
 logging.basicConfig(
@@ -50,6 +52,12 @@ STRATEGY_PARAMS = {
 # File to store previously detected signals
 SIGNALS_CACHE_FILE = 'signals_cache.pkl'
 
+# Latest indicator values per (symbol, interval), carried in the warm-start snapshot
+INDICATOR_TABLE = IndicatorTable()
+
+# Local JSON endpoint for the indicator table, set SCANNER_API_PORT=0 to disable
+QUERY_API_PORT = int(os.getenv("SCANNER_API_PORT", "8765"))
+
 def load_signal_cache():
     """Load previously detected signals from cache file"""
     try:
@@ -69,6 +77,24 @@ def save_signal_cache(cache):
     except Exception as e:
         logging.error(f"Error saving signal cache: {e}")
 
+def restore_warm_start(snapshot=None):
+    """Restore bar history, indicators and signals from the warm-start snapshot"""
+    if snapshot is None:
+        snapshot = load_snapshot()
+
+    seed_history(snapshot['bars'])
+    # Served until the first scan replaces them, labelled with when they were saved
+    if snapshot['indicators']:
+        INDICATOR_TABLE.publish(snapshot['indicators'], updated_at=snapshot['saved_at'])
+
+    # The signal cache file does not survive between workflow runs, the snapshot does
+    if snapshot['signals'] and not os.path.exists(SIGNALS_CACHE_FILE):
+        save_signal_cache(snapshot['signals'])
+
+def save_warm_start():
+    """Write the current state to the warm-start snapshot"""
+    save_snapshot(get_history(), INDICATOR_TABLE.rows(), load_signal_cache())
+
 def check_market_hours():
     """Check if Indian market is currently open"""
     # Indian market hours: 9:15 AM to 3:30 PM IST, Monday to Friday
@@ -87,9 +113,18 @@ def check_market_hours():
     
     return (market_open <= market_time.time() <= market_close)
 
+def next_scan_interval():
+    """Seconds to sleep before the next scan"""
+    # Scan frequency: Every 3 minutes during market hours, every 15 minutes outside
+    if check_market_hours():
+        return 180  # 3 minutes
+    return 900  # 15 minutes
+
 def scan_stocks():
     """Scan stocks for new signals"""
+    scan_started = time.time()
     signal_cache = load_signal_cache()
+    indicators = {}
     buy_signals = []
     sell_signals = []
     
@@ -98,8 +133,8 @@ def scan_stocks():
             cache_key = f"{symbol}_{interval}"
             
             try:
-                # Always get fresh data
-                data = get_data(symbol, interval, force_download=True)
+                # Only the newest bars are downloaded once history is cached
+                data = get_data(symbol, interval)
                 if data is None or len(data) < 3:
                     continue
                 
@@ -108,6 +143,8 @@ def scan_stocks():
                     **STRATEGY_PARAMS
                 )
                 
+                indicators[(symbol, interval)] = indicator_row(enriched)
+                
                 if signal:
                     # Check if this is a new signal we haven't reported yet
                     if cache_key not in signal_cache or signal_cache[cache_key] != signal:
@@ -127,6 +164,13 @@ def scan_stocks():
     # Save updated signal cache
     save_signal_cache(signal_cache)
     
+    # Publish the whole scan to other scanner processes at once, announcing when the
+    # next one is due: the sleep plus about as long as this scan took
+    commit_bar_store(next_scan_interval() + (time.time() - scan_started))
+    
+    # Swap the whole scan into the query table at once, dropping symbols that failed
+    INDICATOR_TABLE.publish(indicators)
+    
     # Send notification if signals found
     if buy_signals or sell_signals:
         message_parts = []
@@ -146,40 +190,45 @@ def scan_stocks():
     return False
 
 def signal_handler(sig, frame):
-    """Handle Ctrl+C gracefully"""
+    """Handle Ctrl+C and the workflow timeout gracefully"""
     logging.info("Stopping realtime scanner...")
-    exit(0)
+    # The snapshot is saved by run_continuous_scanner on the way out. Saving here could
+    # interrupt a save already in progress and leave a corrupt snapshot behind.
+    raise SystemExit(0)
 
-def run_continuous_scanner():
+def run_continuous_scanner(snapshot=None):
     """Run scanner continuously"""
     signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
     
     logging.info("Starting continuous RSI & MACD scanner...")
+    restore_warm_start(snapshot)
     
-    # Initial scan to establish baseline
-    scan_stocks()
-    logging.info("Initial scan complete")
+    if QUERY_API_PORT:
+        start_query_server(INDICATOR_TABLE, port=QUERY_API_PORT)
     
-    # Check market hours info message
-    if not check_market_hours():
-        logging.info("Outside market hours. Scanner will check periodically but signals are less likely.")
-    else:
-        logging.info("Within market hours. Actively scanning for signals.")
-        
     try:
+        # Initial scan to establish baseline
+        scan_stocks()
+        save_warm_start()
+        logging.info("Initial scan complete")
+        
+        # Check market hours info message
+        if not check_market_hours():
+            logging.info("Outside market hours. Scanner will check periodically but signals are less likely.")
+        else:
+            logging.info("Within market hours. Actively scanning for signals.")
+        
         # Main loop
         while True:
-            # Scan frequency: Every 3 minutes during market hours, every 15 minutes outside
-            if check_market_hours():
-                scan_interval = 180  # 3 minutes
-            else:
-                scan_interval = 900  # 15 minutes
-            
-            time.sleep(scan_interval)
+            time.sleep(next_scan_interval())
             
             # Run a scan cycle
             any_signals = scan_stocks()
             
+            # Keep the snapshot current in case the job is cut off before a clean shutdown
+            save_warm_start()
+            
             # Log status
             current_time = datetime.datetime.now().strftime("%H:%M:%S")
             if any_signals:
@@ -190,6 +239,8 @@ def run_continuous_scanner():
     except Exception as e:
         logging.error(f"Error in continuous scanner: {e}")
         raise
+    finally:
+        save_warm_start()
 
 if __name__ == "__main__":
     # Check if environment variables are set
@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import logging
+
+# Columns kept per bar. Each column lives in its own memory-mapped file.
+BAR_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+INDEX_FILE = 'index.json'
+TIMESTAMP_FILE = 'timestamp.i8'
+
+# Rows reserved per series. Covers 1y daily, 2y weekly and 5y monthly history.
+DEFAULT_CAPACITY = 512
+
+class BarStore:
+    """
+    Columnar bar store shared between scanner processes through memory-mapped files
+
+    One writer process stages bars with write() and publishes a whole batch with
+    commit(). Any number of reader processes open the same directory and get
+    zero-copy NumPy views with view(), or a DataFrame with read(), without
+    unpickling or downloading anything.
+
+    Every (symbol, interval) owns two slots of `capacity` rows in each column file.
+    A write fills the slot readers are not using and commit() atomically swaps the
+    index, so a reader never sees a half-written series. Bars keep their position
+    in a slot while the window rolls forward, so a write only touches the rows
+    that changed since that slot was last written, usually just the newest candle.
+    """
+
+    def __init__(self, path, writer=False, capacity=DEFAULT_CAPACITY):
+        import numpy as np
+
+        self._np = np
+        self.path = path
+        self.writer = writer
+        self.capacity = capacity
+        self._index = {'capacity': capacity, 'slots': 0, 'series': {}}
+        self._index_mtime = None
+        self._columns = {}
+        # Writes staged since the last commit, keyed like the index
+        self._pending = {}
+
+        if writer:
+            os.makedirs(path, exist_ok=True)
+        self.refresh()
+
+    @staticmethod
+    def _key(symbol, interval):
+        return f"{symbol}|{interval}"
+
+    def _files(self):
+        files = {name: f"{name}.f8" for name in BAR_COLUMNS}
+        files['timestamp'] = TIMESTAMP_FILE
+        return files
+
+    def _map_columns(self):
+        """(Re)map every column file to cover all allocated slots"""
+        np = self._np
+        rows = self._index['slots'] * self._index['capacity']
+        self._columns = {}
+        if rows == 0:
+            return
+
+        for name, filename in self._files().items():
+            dtype = 'i8' if name == 'timestamp' else 'f8'
+            mode = 'r+' if self.writer else 'r'
+            self._columns[name] = np.memmap(os.path.join(self.path, filename), dtype=dtype, mode=mode, shape=(rows,))
+
+    def refresh(self):
+        """Pick up series published by the writer since the index was last read"""
+        index_path = os.path.join(self.path, INDEX_FILE)
+        try:
+            stat = os.stat(index_path)
+        except FileNotFoundError:
+            return False
+
+        # The index is replaced on every publish, so a new inode means new data
+        mtime = (stat.st_ino, stat.st_mtime_ns)
+        if mtime == self._index_mtime:
+            return False
+
+        with open(index_path) as f:
+            index = json.load(f)
+
+        resized = index['slots'] != self._index['slots']
+        self._index = index
+        self._index_mtime = mtime
+        self.capacity = index['capacity']
+        if resized or not self._columns:
+            self._map_columns()
+        return True
+
+    def _allocate(self):
+        """Grow every column file by one series (two slots) and return its first slot"""
+        np = self._np
+        first_slot = self._index['slots']
+        rows = (first_slot + 2) * self.capacity
+
+        for name, filename in self._files().items():
+            itemsize = np.dtype('i8' if name == 'timestamp' else 'f8').itemsize
+            with open(os.path.join(self.path, filename), 'ab') as f:
+                f.truncate(rows * itemsize)
+
+        self._index['slots'] = first_slot + 2
+        self._map_columns()
+        return first_slot
+
+    def _publish_index(self):
+        # Columns are flushed once per batch, before the index, so readers only follow complete data
+        for column in self._columns.values():
+            column.flush()
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, index_path)
+        stat = os.stat(index_path)
+        self._index_mtime = (stat.st_ino, stat.st_mtime_ns)
+
+    def _place(self, base, window, timestamps):
+        """Row in a slot where the new series starts, keeping existing bars in place"""
+        np = self._np
+        start, length = window
+        stored = self._columns['timestamp'][base + start:base + start + length]
+        pos = int(np.searchsorted(stored, timestamps[0]))
+        if pos < length and stored[pos] == timestamps[0] and start + pos + len(timestamps) <= self.capacity:
+            return start + pos
+        return 0  # No overlap or the slot is full, start over from the top
+
+    def write(self, symbol, interval, data):
+        """Stage the latest bars for a symbol, keeping at most `capacity` rows. Call commit() to publish."""
+        if not self.writer:
+            raise PermissionError("BarStore was opened read-only")
+
+        np = self._np
+        data = data.iloc[-self.capacity:]
+        key = self._key(symbol, interval)
+        entry = self._index['series'].get(key)
+        staged = self._pending.get(key)
+
+        if staged is None:
+            if entry is None:
+                staged = {'slot': self._allocate(), 'target': 0, 'windows': [[0, 0], [0, 0]]}
+            else:
+                # Fill the slot readers are not looking at
+                staged = {'slot': entry['slot'], 'target': 1 - entry['active'], 'windows': [list(w) for w in entry['windows']]}
+
+        index = data.index
+        staged['tz'] = str(index.tz) if index.tz is not None else None
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+
+        new_columns = {'timestamp': index.as_unit('ns').asi8}
+        for name in BAR_COLUMNS:
+            new_columns[name] = np.asarray(data[name], dtype='f8').reshape(-1)
+
+        target = staged['target']
+        base = (staged['slot'] + target) * self.capacity
+        offset = self._place(base, staged['windows'][target], new_columns['timestamp'])
+        region = slice(base + offset, base + offset + len(data))
+
+        # Only rows that differ from what this slot already holds are written
+        changed = np.zeros(len(data), dtype=bool)
+        for name, values in new_columns.items():
+            changed |= self._columns[name][region] != values
+        rows = np.flatnonzero(changed)
+        if len(rows):
+            for name, values in new_columns.items():
+                self._columns[name][base + offset + rows] = values[rows]
+
+        staged['windows'][target] = [offset, len(data)]
+        self._pending[key] = staged
+
+    def commit(self, next_publish_in=None):
+        """
+        Publish every write staged since the last commit in a single index update
+
+        Args:
+            next_publish_in: Seconds until the writer expects to publish again, or None
+                if it will not (e.g. a one-shot scan)
+        """
+        if not self._pending:
+            return
+
+        published_at = time.time()
+        next_publish_at = published_at + next_publish_in if next_publish_in is not None else None
+        for key, staged in self._pending.items():
+            self._index['series'][key] = {
+                'slot': staged['slot'],
+                'active': staged['target'],
+                'windows': staged['windows'],
+                'tz': staged['tz'],
+                'published_at': published_at,
+                'next_publish_at': next_publish_at,
+            }
+        self._pending = {}
+        self._publish_index()
+
+    def write_many(self, series):
+        """Write and publish a batch of {(symbol, interval): data} at once"""
+        for (symbol, interval), data in series.items():
+            self.write(symbol, interval, data)
+        self.commit()
+
+    def view(self, symbol, interval):
+        """Zero-copy column arrays for a symbol, or None if it is not in the store"""
+        self.refresh()
+        entry = self._index['series'].get(self._key(symbol, interval))
+        if entry is None:
+            return None
+
+        start, length = entry['windows'][entry['active']]
+        start += (entry['slot'] + entry['active']) * self.capacity
+        end = start + length
+        return {name: column[start:end] for name, column in self._columns.items()}
+
+    def publish_times(self, symbol, interval):
+        """
+        (published_at, next_publish_at) epoch seconds for a symbol, or None if it is not in the store
+
+        next_publish_at is None when the writer did not promise another update.
+        """
+        self.refresh()
+        entry = self._index['series'].get(self._key(symbol, interval))
+        return (entry['published_at'], entry.get('next_publish_at')) if entry else None
+
+    def read(self, symbol, interval):
+        """Latest bars for a symbol as a DataFrame shaped like get_data's output"""
+        import pandas as pd
+
+        columns = self.view(symbol, interval)
+        if columns is None:
+            return None
+
+        index = pd.DatetimeIndex(columns.pop('timestamp').astype('datetime64[ns]'), name='Date')
+        tz = self._index['series'][self._key(symbol, interval)]['tz']
+        if tz:
+            index = index.tz_localize('UTC').tz_convert(tz)
+
+        data = pd.DataFrame(columns, index=index)
+        data['Symbol'] = symbol
+        return data
+
+    def symbols(self):
+        """All (symbol, interval) pairs currently published"""
+        return [tuple(key.split('|', 1)) for key in self._index['series']]
+
+def open_bar_store(path, writer=False):
+    """Open a bar store, logging and returning None if it cannot be used"""
+    try:
+        return BarStore(path, writer=writer)
+    except Exception as e:
+        logging.error(f"Error opening bar store at {path}: {e}")
+        return None
@@ -1,60 +1,232 @@
-import yfinance as yf
-import pandas as pd
+import os
+import math
+import time
 import logging
 import datetime
 
+# Bar history already fetched in this process, keyed by (symbol, interval).
+# Seeded from the warm-start snapshot so later calls only fetch the newest bars.
+_HISTORY = {}
+
+# Optional bar store shared with other scanner processes. The writer stages every
+# series it fetches and publishes them with commit_bar_store() once per scan, readers
+# take their bars from the store instead of downloading.
+BAR_STORE_DIR = os.getenv("SCANNER_BAR_STORE")
+BAR_STORE_WRITER = os.getenv("SCANNER_BAR_STORE_WRITER") == "1"
+# Readers download themselves once the writer is this late (seconds) for its announced
+# next publish. Writers that announce none, like a one-shot scan, count as fresh for
+# BAR_STORE_MAX_AGE, which covers the longest realtime loop (15 min sleep plus a scan).
+BAR_STORE_GRACE = int(os.getenv("SCANNER_BAR_STORE_GRACE", "120"))
+BAR_STORE_MAX_AGE = int(os.getenv("SCANNER_BAR_STORE_MAX_AGE", "1800"))
+# Oldest last bar a live writer could still be serving, allowing for weekends and holidays
+BAR_STORE_MAX_GAP_DAYS = {'1d': 4, '1wk': 10, '1mo': 35}
+_BAR_STORE = None
+_BAR_STORE_FAILED = False
+
+def get_history():
+    """Return the in-memory bar history keyed by (symbol, interval)"""
+    return _HISTORY
+
+def seed_history(bars):
+    """Populate the in-memory bar history, e.g. from a warm-start snapshot"""
+    # Never replace bars this process has already fetched with older snapshot bars
+    for key, data in (bars or {}).items():
+        _HISTORY.setdefault(key, data)
+
+def get_bar_store():
+    """Open the shared bar store on first use, or return None if it is not configured"""
+    global _BAR_STORE, _BAR_STORE_FAILED
+    if _BAR_STORE is None and BAR_STORE_DIR and not _BAR_STORE_FAILED:
+        from scanner.bar_store import open_bar_store
+        _BAR_STORE = open_bar_store(BAR_STORE_DIR, writer=BAR_STORE_WRITER)
+        # Only try once, otherwise every get_data call would log the same error
+        _BAR_STORE_FAILED = _BAR_STORE is None
+    return _BAR_STORE
+
+def commit_bar_store(next_publish_in=None):
+    """
+    Publish everything this process wrote to the bar store since the last commit
+
+    Args:
+        next_publish_in: Seconds until this process expects to commit again, or None
+    """
+    store = get_bar_store()
+    if store is not None and store.writer:
+        try:
+            store.commit(next_publish_in)
+        except Exception as e:
+            logging.error(f"Error committing the bar store: {e}")
+
+def _history_period(interval):
+    # Adjust period based on interval to ensure enough data for indicators
+    if interval == '1mo':
+        return '5y'  # 5 years for monthly to get enough candles
+    elif interval == '1wk':
+        return '2y'  # 2 years for weekly
+    else:
+        return '1y'  # 1 year for daily
+
+def _gap_days(data):
+    """Days since the last bar in a frame"""
+    last_bar = data.index[-1]
+    if getattr(last_bar, 'tzinfo', None) is not None:
+        last_bar = last_bar.tz_localize(None)
+    return (datetime.datetime.now() - last_bar.to_pydatetime()).days
+
+# Refresh windows per interval with the days they cover, narrowest first. Each one
+# holds a few completed candles besides the one still forming.
+REFRESH_PERIODS = {
+    '1d': (('5d', 5), ('1mo', 28), ('3mo', 88)),
+    '1wk': (('1mo', 28), ('3mo', 88), ('6mo', 180)),
+    '1mo': (('6mo', 180), ('1y', 365)),
+}
+
+def _refresh_periods(history, interval):
+    """Download periods that cover the gap since the last cached bar, narrowest first"""
+    gap_days = _gap_days(history)
+    # An empty list means the cache is too stale, fall back to a full download
+    return [period for period, days in REFRESH_PERIODS.get(interval, REFRESH_PERIODS['1d']) if gap_days + 2 <= days]
+
+def _close(data):
+    close = data['Close']
+    # yfinance can return (Price, Ticker) columns even for a single symbol
+    return close.iloc[:, 0] if close.ndim == 2 else close
+
+def _same_adjustment(history, fresh):
+    """
+    Check that freshly downloaded bars are on the same price basis as the cache
+
+    Downloads are split and dividend adjusted, so after a corporate action every
+    cached bar is on the old basis. Compare the earliest overlapping bar before the
+    last cached one, which may still have been forming when it was cached. Returns
+    None if there is no such bar, so the caller can try a wider window.
+    """
+    overlap = fresh.index.intersection(history.index)
+    overlap = overlap[overlap < history.index[-1]]
+    if len(overlap) == 0:
+        return None
+
+    cached = float(_close(history).loc[overlap[0]])
+    latest = float(_close(fresh).loc[overlap[0]])
+    return math.isclose(cached, latest, rel_tol=1e-4)
+
+def _read_bar_store(store, symbol, interval):
+    """Bars published by the writer process, or None if they are missing, short or stale"""
+    publish_times = store.publish_times(symbol, interval)
+    if publish_times is None:
+        return None
+
+    published_at, next_publish_at = publish_times
+    deadline = next_publish_at + BAR_STORE_GRACE if next_publish_at is not None else published_at + BAR_STORE_MAX_AGE
+    if time.time() > deadline:
+        logging.info(f"Bar store copy of {symbol} [{interval}] is stale, downloading instead")
+        return None
+
+    data = store.read(symbol, interval)
+    if data is None or len(data) < 30:  # Same guard as a fresh download
+        return None
+
+    # Catches a writer that keeps publishing but no longer gets new candles
+    if _gap_days(data) > BAR_STORE_MAX_GAP_DAYS.get(interval, 4):
+        logging.info(f"Bar store has no recent candles for {symbol} [{interval}], downloading instead")
+        return None
+
+    return data
+
+def _refresh(symbol, interval, history):
+    """Merge the newest bars over cached history, or None if a full download is needed"""
+    import pandas as pd
+
+    for period in _refresh_periods(history, interval):
+        logging.info(f"Refreshing cached data for {symbol} with interval {interval} ({period})")
+        fresh = _download(symbol, interval, period)
+        if fresh is None:
+            return history
+
+        same_adjustment = _same_adjustment(history, fresh)
+        if same_adjustment is None:
+            continue  # Only the forming candle overlaps, widen the window
+        if not same_adjustment:
+            # A split or dividend re-based the prices, the cached bars are unusable
+            logging.info(f"Adjusted prices changed for {symbol}, fetching full history")
+            return None
+
+        data = pd.concat([history, fresh])
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        # Keep the same rolling window as a full download would
+        return data.iloc[-max(len(history), len(fresh)):]
+
+    return None
+
+def _download(symbol, interval, period):
+    # yfinance pulls in pandas and friends, so only import it once we actually fetch
+    import yfinance as yf
+
+    # For TradingView compatibility, ensure we get adjusted data
+    data = yf.download(
+        symbol,
+        period=period,
+        interval=interval,
+        auto_adjust=True,  # Important for TradingView compatibility
+        progress=False
+    )
+
+    if data.empty or 'Close' not in data:
+        return None
+
+    # TradingView's indicator calculations typically ignore any candles with NaN values
+    data = data.dropna()
+    data['Symbol'] = symbol
+    return data
+
 def get_data(symbol, interval='1d', force_download=False):
     """
     Get stock data with improved compatibility with TradingView calculations
-    
+
     Args:
         symbol: The stock ticker symbol
         interval: Data interval (1d, 1wk, 1mo)
         force_download: Force fresh download instead of using cache
     """
     try:
-        logging.info(f"Fetching data for {symbol} with interval {interval}")
-        
-        # Adjust period based on interval to ensure enough data for indicators
-        if interval == '1mo':
-            period = '5y'  # 5 years for monthly to get enough candles
-        elif interval == '1wk':
-            period = '2y'  # 2 years for weekly
-        else:
-            period = '1y'  # 1 year for daily
-        
-        # Get current time to ensure we have the latest data
-        current_time = datetime.datetime.now()
-        
-        # For TradingView compatibility, ensure we get adjusted data
-        data = yf.download(
-            symbol, 
-            period=period, 
-            interval=interval, 
-            auto_adjust=True,  # Important for TradingView compatibility
-            progress=False
-        )
-        
-        if data.empty or 'Close' not in data:
+        key = (symbol, interval)
+        store = get_bar_store()
+        if store is not None and not store.writer and not force_download:
+            data = _read_bar_store(store, symbol, interval)
+            if data is not None:
+                logging.info(f"Read {len(data)} data points for {symbol} from the bar store")
+                return data
+
+        history = None if force_download else _HISTORY.get(key)
+        # Only fetch the latest bars and merge them over the cached history
+        data = _refresh(symbol, interval, history) if history is not None else None
+
+        if data is None:
+            logging.info(f"Fetching data for {symbol} with interval {interval}")
+            data = _download(symbol, interval, _history_period(interval))
+
+        if data is None:
             logging.warning(f"No data available for {symbol}")
             return None
 
-        # TradingView's indicator calculations typically ignore any candles with NaN values
-        data = data.dropna()
-        
         # Make sure we have enough data for calculations
         if len(data) < 30:  # Need at least 30 candles for reliable indicators
             logging.warning(f"Not enough data points for {symbol}: only {len(data)} candles")
             return None
-            
-        data['Symbol'] = symbol
+
+        _HISTORY[key] = data
+        if store is not None and store.writer:
+            try:
+                store.write(symbol, interval, data)
+            except Exception as e:
+                logging.error(f"Error publishing {symbol} to the bar store: {e}")
         logging.info(f"Successfully fetched {len(data)} data points for {symbol}")
-        
+
         # Log the last few candles to help with debugging
         logging.debug(f"Last 3 candles for {symbol}:\n{data.tail(3)}")
-        
+
         return data
-        
+
     except Exception as e:
         logging.error(f"Error fetching data for {symbol}: {e}")
         return None
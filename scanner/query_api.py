@@ -0,0 +1,154 @@
+import json
+import math
+import logging
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Indicator fields kept per (symbol, interval) and filterable with <field>_min / <field>_max
+INDICATOR_FIELDS = ('Close', 'RSI', 'MACD', 'Signal', 'Position')
+
+class IndicatorTable:
+    """
+    Latest indicator values per (symbol, interval)
+
+    The scan loop builds a complete new table and swaps it in with publish(), so
+    readers never take a lock and always see one consistent scan. A symbol that
+    failed in the latest scan is left out rather than served with old values.
+    """
+
+    def __init__(self):
+        # (rows, updated_at) replaced as a single reference
+        self._state = ({}, None)
+
+    def publish(self, rows, updated_at=None):
+        """
+        Replace the whole table with the rows of one scan in a single swap
+
+        Args:
+            rows: Indicator rows keyed by (symbol, interval)
+            updated_at: When the rows were computed, defaults to now
+        """
+        self._state = (dict(rows), updated_at or datetime.datetime.now())
+
+    def rows(self):
+        """The current table, which is never mutated after it is published"""
+        return self._state[0]
+
+    @property
+    def updated_at(self):
+        return self._state[1]
+
+    def query(self, symbol=None, interval=None, ranges=None):
+        """
+        Rows matching the given filters, with the time their scan was published
+
+        Args:
+            symbol: Only this ticker symbol
+            interval: Only this data interval (1d, 1wk, 1mo)
+            ranges: {field: (low, high)} bounds, either side may be None
+
+        Returns:
+            (results, updated_at) taken from the same published scan
+        """
+        rows, updated_at = self._state
+        ranges = ranges or {}
+        results = []
+        for (row_symbol, row_interval), row in rows.items():
+            if symbol and row_symbol != symbol:
+                continue
+            if interval and row_interval != interval:
+                continue
+            if any(not _in_range(row.get(field), low, high) for field, (low, high) in ranges.items()):
+                continue
+            results.append({'symbol': row_symbol, 'interval': row_interval, **row})
+        return results, updated_at
+
+def indicator_row(enriched):
+    """Latest indicator values from a calculate_rsi_macd frame, JSON ready"""
+    latest = enriched.iloc[-1]
+    row = {}
+    for field in INDICATOR_FIELDS:
+        value = float(latest[field])
+        row[field] = None if math.isnan(value) else value
+    row['Time'] = str(enriched.index[-1])
+    return row
+
+def _in_range(value, low, high):
+    if value is None:
+        return False
+    if low is not None and value < low:
+        return False
+    if high is not None and value > high:
+        return False
+    return True
+
+def _parse_bound(values):
+    if values is None:
+        return None
+    bound = float(values[0])
+    # float() accepts nan and inf, which would make the filter match everything
+    if not math.isfinite(bound):
+        raise ValueError(f"bound must be a finite number: {values[0]!r}")
+    return bound
+
+def _parse_ranges(params):
+    ranges = {}
+    for field in INDICATOR_FIELDS:
+        low = params.get(f"{field.lower()}_min")
+        high = params.get(f"{field.lower()}_max")
+        if low is not None or high is not None:
+            ranges[field] = (_parse_bound(low), _parse_bound(high))
+    return ranges
+
+def _make_handler(table):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.rstrip('/') != '/indicators':
+                self._send(404, {'error': f"Unknown path {url.path}"})
+                return
+
+            params = parse_qs(url.query)
+            try:
+                ranges = _parse_ranges(params)
+            except ValueError as e:
+                self._send(400, {'error': f"Invalid filter value: {e}"})
+                return
+
+            symbol = params.get('symbol', [None])[0]
+            interval = params.get('interval', [None])[0]
+            results, updated_at = table.query(symbol.upper() if symbol else None, interval, ranges)
+            updated_at = updated_at.isoformat() if updated_at else None
+            self._send(200, {'updated_at': updated_at, 'count': len(results), 'results': results})
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logging.debug(f"Query API: {format % args}")
+
+    return QueryHandler
+
+def start_query_server(table, host='127.0.0.1', port=8765):
+    """
+    Serve the indicator table as JSON on a background thread
+
+    GET /indicators?symbol=RELIANCE.NS&interval=1d&rsi_min=45&rsi_max=55
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _make_handler(table))
+    except OSError as e:
+        logging.error(f"Could not start query API on {host}:{port}: {e}")
+        return None
+
+    thread = threading.Thread(target=server.serve_forever, name='query-api', daemon=True)
+    thread.start()
+    logging.info(f"Query API listening on http://{host}:{port}/indicators")
+    return server
@@ -1,5 +1,5 @@
 import logging
-from scanner.data import get_data
+from scanner.data import get_data, commit_bar_store
 from scanner.strategy import calculate_rsi_macd
 from scanner.telegram_bot import send_telegram_message
 
@@ -80,6 +80,9 @@ def run():
             except Exception as e:
                 logging.error(f"Error processing {symbol} [{label}]: {e}")
     
+    # Publish the whole scan to other scanner processes at once
+    commit_bar_store()
+    
     # Build the message
     message_parts = []
     
@@ -0,0 +1,69 @@
+import os
+import gzip
+import pickle
+import tempfile
+import logging
+import datetime
+
+# Warm-start bundle written at shutdown and restored at startup (kept in the Actions cache)
+SNAPSHOT_FILE = os.getenv("SCANNER_SNAPSHOT_FILE", os.path.join('.warm_start', 'snapshot.pkl.gz'))
+SNAPSHOT_VERSION = 1
+
+def save_snapshot(bars, indicators, signals, path=SNAPSHOT_FILE):
+    """
+    Save bar history, latest indicator values and reported signals to a compressed bundle
+
+    Args:
+        bars: Bar history DataFrames keyed by (symbol, interval)
+        indicators: Latest indicator values keyed by (symbol, interval)
+        signals: Signal cache as used by the realtime scanner
+        path: Snapshot file location
+    """
+    tmp_path = None
+    try:
+        snapshot_dir = os.path.dirname(path) or '.'
+        os.makedirs(snapshot_dir, exist_ok=True)
+        bundle = {
+            'version': SNAPSHOT_VERSION,
+            'saved_at': datetime.datetime.now(),
+            'bars': dict(bars),
+            'indicators': dict(indicators),
+            'signals': dict(signals),
+        }
+
+        # Write to a temp file of our own first so an interrupted save never leaves a corrupt snapshot
+        fd, tmp_path = tempfile.mkstemp(dir=snapshot_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wb', compresslevel=3) as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        tmp_path = None
+
+        logging.info(f"Saved warm-start snapshot with {len(bundle['bars'])} series to {path}")
+        return True
+    except Exception as e:
+        logging.error(f"Error saving warm-start snapshot: {e}")
+        return False
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """Load a warm-start bundle, returning empty state if it is missing or unusable"""
+    empty = {'bars': {}, 'indicators': {}, 'signals': {}, 'saved_at': None}
+    try:
+        if not os.path.exists(path):
+            logging.info("No warm-start snapshot found, starting cold")
+            return empty
+
+        with gzip.open(path, 'rb') as f:
+            bundle = pickle.load(f)
+
+        if bundle.get('version') != SNAPSHOT_VERSION:
+            logging.warning(f"Ignoring warm-start snapshot with version {bundle.get('version')}")
+            return empty
+
+        logging.info(f"Loaded warm-start snapshot from {bundle['saved_at']} with {len(bundle['bars'])} series")
+        return {key: bundle.get(key, default) for key, default in empty.items()}
+    except Exception as e:
+        logging.error(f"Error loading warm-start snapshot: {e}")
+        return empty
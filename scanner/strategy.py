@@ -1,5 +1,3 @@
-import pandas as pd
-import numpy as np
 import logging
 
 def calculate_rsi_macd(data, fast_length=8, slow_length=16, signal_length=11, 
@@ -1,9 +1,11 @@
 import os
-import requests
 import logging
 
 def send_telegram_message(message):
     try:
+        # Deferred so the scanner starts without paying for the requests import
+        import requests
+
         token = os.getenv("TELEGRAM_BOT_TOKEN")
         chat_id = os.getenv("TELEGRAM_CHAT_ID")
         